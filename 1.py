@@ -1,5 +1,10 @@
-import json
-from bs4 import BeautifulSoup
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+import orjson
+import os
+from selectolax.lexbor import LexborHTMLParser
 from tqdm import tqdm
 import re
 
@@ -25,20 +30,39 @@ ACCENT_MAP = {
 }
 
 
+_ACCENT_TABLE = str.maketrans(ACCENT_MAP)
+
+# Parenthesized optional parts of a reading, e.g. "(е́сли) бог даст"
+_PAREN_KEEP = re.compile(r"\(([^)]*)\)")
+_PAREN_DROP = re.compile(r"\([^)]*\)")
+
+_VOWELS = frozenset("аеёиоуыэюяАЕЁИОУЫЭЮЯ")
+
+# ё is folded before lowercasing, so Ё is deliberately left alone
+_NORMALIZE_TABLE = str.maketrans({"ё": "е", "\u0301": None, "-": None, " ": None})
+
+# Lines per batch submitted to the process pool (at most two in flight)
+_BATCH_SIZE = 16384
+
+# Hardcoded exception as revision
+_EXCEPTIONS = frozenset(["незарифленный", "обдернуться", "обмерзать"])
+
+
 def has_accented_vowels(text):
     """Check if text contains any stress markers (acute accents or ё)"""
-    return any(accent in text for accent in ACCENT_MAP.values()) or "ё" in text.lower()
+    # Every ACCENT_MAP value is a vowel followed by U+0301
+    return "\u0301" in text or "ё" in text or "Ё" in text
 
 
 def should_use_reading(text, reading_candidate):
     """Determine whether to use the reading candidate"""
-    # Count the number of vowels in the headword
-    vowels_in_headword = sum(1 for char in text if char.lower() in "аеёиоуыэюя")
-
     # Rule 1: Always empty if no acute vowels
     if not has_accented_vowels(reading_candidate):
         return False
 
+    # Count the number of vowels in the headword
+    vowels_in_headword = sum(1 for char in text if char in _VOWELS)
+
     # Rule 2: Empty if headword has only one vowel (stress is unambiguous)
     if vowels_in_headword <= 1 and "ё" not in reading_candidate.lower():
         return False
@@ -47,63 +71,66 @@ def should_use_reading(text, reading_candidate):
 
 
 def process_b_tag(b_tag):
-    """Extract text from <b> tag and replace accented vowels"""
-    text = ""
-    for child in b_tag.children:
-        if isinstance(child, str):
-            text += child
-        elif child.name == "u" and "accent" in child.get("class", []):
-            vowel = child.string
-            if vowel in ACCENT_MAP:
-                text += ACCENT_MAP[vowel]
+    """Extract text from <b> tag and replace accented vowels
+
+    Returns the text and whether the tag contains any <u class="accent">.
+    """
+    parts = []
+    has_accent = False
+    for child in b_tag.iter(include_text=True):
+        if child.is_text_node:
+            parts.append(child.text_content)
+        elif (
+            child.tag == "u"
+            and "accent" in (child.attributes.get("class") or "").split()
+        ):
+            has_accent = True
+            vowel = child.text()
+            if len(vowel) == 1:
+                parts.append(vowel.translate(_ACCENT_TABLE))
             else:
-                text += vowel
+                parts.append(vowel)
         else:
             # For any other element, get its text content
-            text += child.get_text()
-    return text
+            parts.append(child.text())
+            if not has_accent:
+                has_accent = child.css_first("u.accent") is not None
+    return "".join(parts), has_accent
 
 
 def clean_html_and_extract_readings(html_str):
     """Remove audio tags and extract readings from initial <b> tags"""
-    soup = BeautifulSoup(html_str, "html.parser")
+    tree = LexborHTMLParser(html_str)
+    body = tree.body
 
     # Remove all audio tags
-    for obj in soup.find_all("object"):
+    for obj in body.css("object"):
         obj.decompose()
 
-    # Extract readings from top-level <b> tags
+    # Extract readings from top-level <b> tags in a single pass, which also
+    # finds the first top-level block (e.g., <p>, <div>, etc.)
     readings = []
-    for element in soup.find_all(recursive=False):
-        if element.name == "b":
-            content = element.get_text().strip()
-            if len(content) == 1 and content in "IVX":
-                break
-            has_accent = bool(element.find("u", class_="accent"))
-            if not has_accent:
-                break
-            readings.append(process_b_tag(element))
-        elif element.name != "br":  # Stop at first non-br element
-            break
+    first_block = None
+    for element in body.iter(include_text=False):
+        if element.tag == "br":
+            continue
+        if element.tag == "b":
+            reading, has_accent = process_b_tag(element)
+            content = reading.strip()
+            if has_accent and not (len(content) == 1 and content in "IVX"):
+                readings.append(reading)
+                continue
+        first_block = element  # Stop at first non-br element
+        break
 
     if not readings:
-        # Get the first top-level block (e.g., <p>, <div>, etc.)
-        first_block = next(
-            (
-                child
-                for child in soup.children
-                if child.name not in [None, "object", "br"]
-            ),
-            None,
-        )
-
         # Check if the first block is a <font> tag with color="green"
         if (
             first_block
-            and first_block.name == "font"
-            and first_block.get("color", "").lower() == "green"
+            and first_block.tag == "font"
+            and (first_block.attributes.get("color") or "").lower() == "green"
         ):
-            text = first_block.get_text().strip()
+            text = first_block.text().strip()
             if text.startswith("(") and text.endswith(")"):
                 first_paren = text[text.find("(") + 1 : text.find(")")].strip()
                 if "ё" in first_paren:
@@ -123,11 +150,29 @@ def clean_html_and_extract_readings(html_str):
     #     else:
     #         break
 
-    return str(soup), readings
+    return body, readings
+
 
+# CSS properties copied through with their value
+_SIMPLE_KEYS = {
+    "color": "color",
+    "margin-left": "marginLeft",
+    "padding-left": "paddingLeft",
+    "margin": "margin",
+    "padding": "padding",
+}
+
+# CSS properties only kept for one specific value
+_VALUE_KEYS = {
+    ("font-style", "italic"): ("fontStyle", "italic"),
+    ("font-weight", "bold"): ("fontWeight", "bold"),
+    ("text-decoration", "underline"): ("textDecorationLine", "underline"),
+}
 
+
+@lru_cache(maxsize=4096)
 def convert_style(style_str):
-    """Convert HTML style to Yomitan style object"""
+    """Convert HTML style to Yomitan style object (cached, do not mutate)"""
     if not style_str:
         return {}
 
@@ -138,83 +183,76 @@ def convert_style(style_str):
             continue
         key, value = [p.strip() for p in prop.split(":", 1)]
 
-        if key == "color":
-            styles["color"] = value
-        elif key == "margin-left":
-            styles["marginLeft"] = value
-        elif key == "padding-left":
-            styles["paddingLeft"] = value
-        elif key == "margin":
-            styles["margin"] = value
-        elif key == "padding":
-            styles["padding"] = value
-        elif key == "font-style" and value == "italic":
-            styles["fontStyle"] = "italic"
-        elif key == "font-weight" and value == "bold":
-            styles["fontWeight"] = "bold"
-        elif key == "text-decoration" and value == "underline":
-            styles["textDecorationLine"] = "underline"
+        if key in _SIMPLE_KEYS:
+            styles[_SIMPLE_KEYS[key]] = value
+        elif (key, value) in _VALUE_KEYS:
+            style_key, style_value = _VALUE_KEYS[key, value]
+            styles[style_key] = style_value
 
     return styles
 
 
-def convert_html_to_content(html_str):
-    """Convert HTML fragment to Yomitan structured content"""
-    soup = BeautifulSoup(f"<div>{html_str}</div>", "html.parser")
-    root = soup.div
+def convert_html_to_content(root):
+    """Convert a parsed HTML fragment to Yomitan structured content"""
+    # The fragment root (e.g. <body>) becomes a bare wrapping div
+    root_content = []
+
+    # Explicit stack of (node, list receiving its converted form). Children
+    # are pushed in reverse so they are popped, and appended, in order.
+    stack = [
+        (child, root_content) for child in reversed(list(root.iter(include_text=True)))
+    ]
+    while stack:
+        node, sink = stack.pop()
 
-    def process_node(node):
-        if node.name is None:  # Text node
-            return str(node)
+        if node.is_text_node:
+            text = node.text_content
+            if text:
+                sink.append(text)
+            continue
+
+        name = node.tag
+        attrs = node.attributes
 
         # Handle <br> tags as line breaks
-        if node.name == "br":
-            return {"tag": "br"}
+        if name == "br":
+            sink.append({"tag": "br"})
+            continue
 
         # Convert font tags to spans and handle color attribute
-        if node.name == "font":
-            color = node.get("color")
+        if name == "font":
+            color = attrs.get("color")
             if color:
-                # Create a span with color style
-                span = soup.new_tag("span")
-                span["style"] = f"color: {color};"
-                # Move children to new span
-                for child in node.contents:
-                    span.append(child)
-                node.replace_with(span)
-                # Reprocess the new node
-                return process_node(span)
-            else:
-                # Treat as regular span
-                node.name = "span"
+                # Treat as a span carrying only the color style
+                attrs = {"style": f"color: {color};"}
+            # Otherwise treat as regular span
+            name = "span"
 
         # Handle different element types
-        if node.name in ["div", "span"]:
-            tag = node.name
-        elif node.name == "a" and node.get("href"):
+        if name in ["div", "span"]:
+            tag = name
+        elif name == "a" and attrs.get("href"):
             tag = "a"
-        elif node.name == "p":
+        elif name == "p":
             tag = "div"
         else:
             tag = "span"
 
-        # Process children
+        # Create node object; its content is filled in as children are popped
         content = []
-        for child in node.children:
-            processed = process_node(child)
-            if processed:
-                content.append(processed)
-
-        # Handle empty content
-        if not content:
-            content = [""]
-
-        # Create node object
         node_obj = {"tag": tag, "content": content}
+        sink.append(node_obj)
+
+        children = list(node.iter(include_text=True))
+        if any(not child.is_text_node or child.text_content for child in children):
+            stack.extend((child, content) for child in reversed(children))
+        else:
+            # Handle empty content
+            content.append("")
 
         # Special handling for links
-        if node.name == "a" and node.get("href"):
-            href = node["href"]
+        if name == "a" and attrs.get("href"):
+            href = attrs["href"]
             if href.startswith("bword://"):
                 href = href.replace(
                     "bword://", "", 1
@@ -224,221 +262,280 @@ def convert_html_to_content(html_str):
             node_obj["href"] = href
 
         # Add styling
-        style = convert_style(node.get("style", ""))
+        style = convert_style(attrs.get("style") or "")
         if style:
-            node_obj["style"] = style
+            # Copy, since the cached dict is shared between nodes
+            node_obj["style"] = dict(style)
 
         # Handle semantic tags
-        if node.name == "i" and "fontStyle" not in node_obj.get("style", {}):
+        if name == "i" and "fontStyle" not in node_obj.get("style", {}):
             node_obj.setdefault("style", {})["fontStyle"] = "italic"
-        if node.name == "b" and "fontWeight" not in node_obj.get("style", {}):
+        if name == "b" and "fontWeight" not in node_obj.get("style", {}):
             node_obj.setdefault("style", {})["fontWeight"] = "bold"
-        if node.name == "u" and "textDecorationLine" not in node_obj.get("style", {}):
+        if name == "u" and "textDecorationLine" not in node_obj.get("style", {}):
             node_obj.setdefault("style", {})["textDecorationLine"] = "underline"
 
         # Handle class attribute
-        if node.get("class"):
-            node_obj.setdefault("data", {})["class"] = " ".join(node["class"])
+        classes = (attrs.get("class") or "").split()
+        if classes:
+            node_obj.setdefault("data", {})["class"] = " ".join(classes)
 
-        return node_obj
-
-    return process_node(root)
+    return {"tag": "div", "content": root_content or [""]}
 
 
 # Normalize both strings for comparison
 def normalize(s):
-    return (
-        s.replace("ё", "е")
-        .replace("\u0301", "")
-        .replace("-", "")
-        .replace(" ", "")
-        .lower()
-    )
-
-
-def convert_to_yomitan(input_lines, debug):
-    """Convert Lingvo Ru-En dictionary to Yomitan JSON format"""
-    entries = []
-    non_empty_lines = [line for line in input_lines if line.strip()]
-    sequence = 0
+    return s.translate(_NORMALIZE_TABLE).lower()
+
+
+def process_line(line, debug):
+    """Process one dictionary line into (headword, reading, content) tuples"""
+    results = []
     reading_or_link_num = 0
     phrases_num = 0
 
-    for line in tqdm(non_empty_lines, desc="Processing entries", unit="entry"):
-        line_copy = line
-        # Find the position of the first "<" to separate headword and HTML
-        first_lt = line.find("<")
-        if first_lt == -1:
-            continue  # Skip if no HTML found
+    line_copy = line
+    # Split at the first "<" to separate headword and HTML
+    headword_str, sep, html_str = line.partition("<")
+    if not sep:
+        return [], 0, 0  # Skip if no HTML found
 
-        # Hardcoded exception as revision
-        exceptions = ["незарифленный", "обдернуться", "обмерзать"]
+    headword_str = headword_str.strip()
+    html_str = "<" + html_str.rstrip()
 
-        headword_str = line[:first_lt].strip()
-        html_str = line[first_lt:].strip()
+    if headword_str in _EXCEPTIONS:
+        return [], 0, 0
 
-        if headword_str in exceptions:
-            continue
+    # Split multiple headwords separated by pipes
+    headwords = [h.strip() for h in headword_str.split("|")]
 
-        # Split multiple headwords separated by pipes
-        headwords = [h.strip() for h in headword_str.split("|")]
+    # Process HTML and extract readings
+    body, readings_list = clean_html_and_extract_readings(html_str)
+    readings_list = deque(readings_list)
+    structured_content = convert_html_to_content(body)
 
-        # Process HTML and extract readings
-        cleaned_html, readings_list = clean_html_and_extract_readings(html_str)
-        structured_content = convert_html_to_content(cleaned_html)
+    is_phrase = False
 
-        is_phrase = False
+    for headword in headwords:
+        if " " in headword:
+            is_phrase = True
+            break
 
-        for headword in headwords:
-            if " " in headword:
-                is_phrase = True
-                break
+    if not is_phrase:
+        # Audio tags never carry links, so the raw HTML is checked directly
+        if not readings_list and "bword" in html_str:
+            reading_or_link_num += 1
+        else:
+            reading_or_link_num += len(readings_list)
+
+    # Create entries for each headword
+    for headword in headwords:
+        # Determine reading: phrases keep original, words use extracted reading
+        # Sometimes phrase has reading: Али Баба
+        if " " in headword:
+            phrases_num += 1
+        reading = ""
+        if readings_list:
+            reading_candidate = readings_list[0]
+            norm_headword = normalize(headword)
+            if "(" in reading_candidate and ")" in reading_candidate:
+                # Variant 1: With parenthetical content (remove parentheses but keep content)
+                variant1 = _PAREN_KEEP.sub(r"\1", reading_candidate)
 
-        if not is_phrase:
-            if not readings_list and "bword" in cleaned_html:
-                reading_or_link_num += 1
-            else:
-                reading_or_link_num += len(readings_list)
-
-        # Create entries for each headword
-        for headword in headwords:
-            # Determine reading: phrases keep original, words use extracted reading
-            # Sometimes phrase has reading: Али Баба
-            if " " in headword:
-                phrases_num += 1
-            reading = ""
-            if readings_list:
-                reading_candidate = readings_list[0]
-                if "(" in reading_candidate and ")" in reading_candidate:
-                    # Variant 1: With parenthetical content (remove parentheses but keep content)
-                    variant1 = re.sub(r"\(([^)]*)\)", r"\1", reading_candidate)
-
-                    # Variant 2: Without parenthetical content (remove parentheses and their content)
-                    variant2 = re.sub(r"\([^)]*\)", "", reading_candidate)
-
-                    # Clean up whitespace and return non-empty variants
-                    variants = [" ".join(variant1.split()), " ".join(variant2.split())]
-
-                    for variant in variants:
-                        norm_reading = normalize(variant)
-                        norm_headword = normalize(headword)
-
-                        if norm_reading == norm_headword:
-                            _ = readings_list.pop(0)
-                            reading = (
-                                variant
-                                if should_use_reading(headword, variant)
-                                else headword
-                            )
-                else:
-                    norm_reading = normalize(reading_candidate)
-                    norm_headword = normalize(headword)
-                    reading_space_num = reading_candidate.count(" ")
-                    headword_space_num = headword.count(" ")
-                    if (
-                        norm_reading != norm_headword
-                        or reading_space_num != headword_space_num
-                    ):
-                        reading = headword
-                    else:
-                        reading_candidate = readings_list.pop(0)
+                # Variant 2: Without parenthetical content (remove parentheses and their content)
+                variant2 = _PAREN_DROP.sub("", reading_candidate)
+
+                # Clean up whitespace and return non-empty variants
+                variants = [" ".join(variant1.split()), " ".join(variant2.split())]
+
+                for variant in variants:
+                    norm_reading = normalize(variant)
+
+                    if norm_reading == norm_headword:
+                        _ = readings_list.popleft()
                         reading = (
-                            reading_candidate
-                            if should_use_reading(headword, reading_candidate)
+                            variant
+                            if should_use_reading(headword, variant)
                             else headword
                         )
             else:
-                reading = headword
-
-            try:
-                reading_space_num = reading.count(" ")
+                norm_reading = normalize(reading_candidate)
+                reading_space_num = reading_candidate.count(" ")
                 headword_space_num = headword.count(" ")
-
-                if reading_space_num != headword_space_num:
-                    raise ValueError(
-                        "Word Num Not Match!\n"
-                        f"Reading validation failed: '{reading}'"
-                        f"doesn't match headword '{headword}'\n"
-                    )
-
-                reading_words = reading.split(" ")
-                headword_words = headword.split(" ")
-
-                for i in range(len(reading_words)):
-                    if "ё" in reading_words[i]:
-                        headword_words[i] = reading_words[i]
-
-                headword = " ".join(headword_words)
-
-                norm_reading = normalize(reading)
-                norm_headword = normalize(headword)
-                reading_space_num = reading.count(" ")
-                headword_space_num = headword.count(" ")
-
                 if (
                     norm_reading != norm_headword
                     or reading_space_num != headword_space_num
                 ):
-                    raise ValueError(
-                        f"Reading validation failed: '{reading}'"
-                        f"doesn't match headword '{headword}'\n"
-                        f"norm_reading '{norm_reading}'\n"
-                        f"norm_headword '{norm_headword}'"
+                    reading = headword
+                else:
+                    reading_candidate = readings_list.popleft()
+                    reading = (
+                        reading_candidate
+                        if should_use_reading(headword, reading_candidate)
+                        else headword
                     )
-
-                # Build Yomitan entry with proper schema compliance
-                entry = [
-                    headword,  # Term
-                    reading,  # Reading
-                    "",  # Definition tags
-                    "",  # Rules
-                    0,  # Score
-                    [{"type": "structured-content", "content": structured_content}],
-                    sequence,  # Sequence
-                    "",  # Term tags
-                ]
-
-            except ValueError as e:
-                # Write the line_copy to test.txt when ValueError is raised
-                if debug:
-                    with open("test.txt", "a", encoding="utf-8") as f:
-                        f.write(line_copy)
-                # Re-raise the exception if you want to stop execution or handle it elsewhere
-                raise e
-
-            entries.append(entry)
-            sequence += 1
-
-        if readings_list:
+        else:
+            reading = headword
+
+        try:
+            reading_space_num = reading.count(" ")
+            headword_space_num = headword.count(" ")
+
+            if reading_space_num != headword_space_num:
+                raise ValueError(
+                    "Word Num Not Match!\n"
+                    f"Reading validation failed: '{reading}'"
+                    f"doesn't match headword '{headword}'\n"
+                )
+
+            reading_words = reading.split(" ")
+            headword_words = headword.split(" ")
+
+            for i in range(len(reading_words)):
+                if "ё" in reading_words[i]:
+                    headword_words[i] = reading_words[i]
+
+            headword = " ".join(headword_words)
+
+            norm_reading = normalize(reading)
+            norm_headword = normalize(headword)
+            reading_space_num = reading.count(" ")
+            headword_space_num = headword.count(" ")
+
+            if norm_reading != norm_headword or reading_space_num != headword_space_num:
+                raise ValueError(
+                    f"Reading validation failed: '{reading}'"
+                    f"doesn't match headword '{headword}'\n"
+                    f"norm_reading '{norm_reading}'\n"
+                    f"norm_headword '{norm_headword}'"
+                )
+
+        except ValueError as e:
+            # Write the line_copy to test.txt when ValueError is raised
             if debug:
                 with open("test.txt", "a", encoding="utf-8") as f:
                     f.write(line_copy)
+            # Re-raise the exception if you want to stop execution or handle it elsewhere
+            raise e
+
+        results.append((headword, reading, structured_content))
+
+    if readings_list:
+        if debug:
+            with open("test.txt", "a", encoding="utf-8") as f:
+                f.write(line_copy)
+
+        for reading in readings_list:
+            print(reading)
+
+        raise ValueError("Readings not used up!")
+
+    return results, reading_or_link_num, phrases_num
+
 
-            for reading in readings_list:
-                print(reading)
+def map_in_batches(executor, fn, iterable):
+    """Ordered executor.map over iterable with a bounded number of lines in flight
 
-            raise ValueError("Readings not used up!")
+    Executor.map submits its whole input up front, so the input is cut into
+    batches of _BATCH_SIZE lines. The next batch is submitted before the
+    results of the current one are yielded, keeping the pool busy while at
+    most two batches are held at once.
+    """
+    # islice must resume where the previous batch stopped
+    iterable = iter(iterable)
+    batches = iter(lambda: list(islice(iterable, _BATCH_SIZE)), [])
+    pending = deque()
+    for batch in batches:
+        pending.append(executor.map(fn, batch, chunksize=256))
+        if len(pending) > 1:
+            yield from pending.popleft()
+    while pending:
+        yield from pending.popleft()
 
-    return entries, reading_or_link_num, phrases_num
+
+def convert_to_yomitan(input_lines, debug, stats):
+    """Convert Lingvo Ru-En dictionary to Yomitan entries, yielded one at a time
+
+    ``input_lines`` may be any iterable of lines, e.g. an open file, and is
+    consumed lazily. Reading/link and phrase counts are accumulated into
+    ``stats``.
+    """
+    non_empty_lines = (line for line in input_lines if line.strip())
+    sequence = 0
+
+    # Lines are independent, so fan them out across CPU cores
+    with ProcessPoolExecutor() as executor:
+        results = map_in_batches(
+            executor, partial(process_line, debug=debug), non_empty_lines
+        )
+        try:
+            for line_results, line_reading_num, line_phrases_num in tqdm(
+                results,
+                desc="Processing entries",
+                unit="entry",
+                mininterval=0.5,
+                miniters=1000,
+                smoothing=0.1,
+            ):
+                stats["readings"] += line_reading_num
+                stats["phrases"] += line_phrases_num
+
+                # Sequence numbers are assigned here to preserve input ordering
+                for headword, reading, structured_content in line_results:
+                    # Build Yomitan entry with proper schema compliance
+                    entry = [
+                        headword,  # Term
+                        reading,  # Reading
+                        "",  # Definition tags
+                        "",  # Rules
+                        0,  # Score
+                        [{"type": "structured-content", "content": structured_content}],
+                        sequence,  # Sequence
+                        "",  # Term tags
+                    ]
+                    yield entry
+                    sequence += 1
+        except BaseException:
+            # The batch queued behind a failing one would otherwise still
+            # run to completion before the pool shuts down
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def write_term_bank(path, entries):
+    """Stream entries into a Yomitan term bank JSON array"""
+    # Write next to the target and swap it in only once complete, so a
+    # failed run leaves the previous term bank intact
+    tmp_path = path + ".tmp"
+    try:
+        # Term banks are machine-read, so skip pretty printing
+        with open(tmp_path, "wb") as f:
+            f.write(b"[")
+            for i, entry in enumerate(entries):
+                if i:
+                    f.write(b",")
+                f.write(orjson.dumps(entry))
+            f.write(b"]")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
 
 
 # Example usage
 if __name__ == "__main__":
+    stats = {"readings": 0, "phrases": 0}
     with open("test.txt", "r", encoding="utf-8") as f:
-        test_lines = f.readlines()
+        for _ in convert_to_yomitan(f, debug=False, stats=stats):
+            pass
 
-    test_data, readings_num, phrases_num = convert_to_yomitan(test_lines, debug=False)
-
-    print(readings_num, phrases_num)
+    print(stats["readings"], stats["phrases"])
 
+    stats = {"readings": 0, "phrases": 0}
     with open("LingvoUniversalRuEn.txt", "r", encoding="utf-8") as f:
-        input_lines = f.readlines()
-
-    yomitan_data, readings_num, phrases_num = convert_to_yomitan(
-        input_lines, debug=True
-    )
-
-    print(readings_num, phrases_num)
+        write_term_bank(
+            "term_bank_1.json", convert_to_yomitan(f, debug=True, stats=stats)
+        )
 
-    with open("term_bank_1.json", "w", encoding="utf-8") as f:
-        json.dump(yomitan_data, f, ensure_ascii=False, indent=2)
+    print(stats["readings"], stats["phrases"])